@@ -6,18 +6,286 @@
 Если же переданы аргументы командной строки, то используется стандартный CLI через argparse.
 """
 
+import io
+import os
+import select
+import sqlite3
 import sys
-import argparse
-from operations import add_task, update_task, delete_task, mark_task, list_tasks
+import time
+from operations import (add_task, add_many, update_task, delete_task, mark_task, iter_tasks,
+                        begin_transaction, commit_transaction, close_connection)
+
+# Наибольшее количество изменений в одной транзакции интерактивного режима
+COMMIT_EVERY = 32
+
+# Наибольшее время (в секундах), которое транзакция интерактивного режима может оставаться открытой
+COMMIT_INTERVAL = 1.0
+
+# Соответствие пунктов меню выбора статуса значениям статуса задачи
+_STATUS_MAP = {"1": "todo", "2": "in_progress", "3": "done"}
+
+# Файл истории ввода интерактивного режима
+HISTORY_FILE = os.path.expanduser("~/.task_tracker_history")
+
+# Наибольшее количество строк, сохраняемых в HISTORY_FILE
+HISTORY_LENGTH = 1000
+
+# Состояние текущей пачки изменений интерактивного режима (см. _begin_write и _commit_batch):
+# количество изменений в открытой транзакции и момент ее открытия (None – транзакции нет)
+_batch_size = 0
+_batch_started = None
 
 
 def interactive_mode():
     """
     Интерактивный режим работы Task Tracker. Пользователю показывается меню с возможными действиями.
     Программа ждёт ввода команды и выполняет соответствующие функции.
+
+    Изменения, идущие подряд без ожидания ввода (например, при вставке нескольких команд
+    или вводе из файла), объединяются в одну транзакцию. Транзакция фиксируется перед тем,
+    как программа начнет ждать ввода, перед показом списка задач, а также после
+    COMMIT_EVERY изменений или COMMIT_INTERVAL секунд, поэтому она не мешает другим процессам.
     """
     print("Запускается интерактивный режим Task Tracker CLI")
     print("-------------------------------------------------")
+    readline = _setup_readline()
+    try:
+        try:
+            _interactive_loop()
+        except (KeyboardInterrupt, EOFError):
+            # Ctrl+C или конец ввода – завершаем работу, сохранив сделанные изменения
+            print("\nДо свидания!")
+        try:
+            _commit_batch()
+        except sqlite3.OperationalError as error:
+            print(f"Не удалось сохранить изменения: {error}")
+    finally:
+        # Историю сохраняем при любом завершении, в том числе из-за исключения
+        if readline is not None:
+            try:
+                readline.write_history_file(HISTORY_FILE)
+            except OSError:
+                pass
+
+
+def _setup_readline():
+    """
+    Подключает модуль readline, чтобы input() поддерживал редактирование строки
+    и историю ввода, и загружает историю из HISTORY_FILE (не более HISTORY_LENGTH строк).
+
+    Модуль подключается, только если ввод идет с терминала. На Windows readline
+    доступен при установленном пакете pyreadline3.
+
+    Returns:
+        module | None: Модуль readline или None, если он недоступен или не нужен.
+    """
+    if not sys.stdin.isatty():
+        return None
+    try:
+        import readline
+    except ImportError:
+        return None
+    # Ограничиваем историю, чтобы файл не рос бесконечно
+    readline.set_history_length(HISTORY_LENGTH)
+    try:
+        readline.read_history_file(HISTORY_FILE)
+    except OSError:
+        # Файла истории еще нет или он недоступен – начинаем с пустой истории
+        pass
+    return readline
+
+
+def _begin_write():
+    """
+    Открывает транзакцию на запись (BEGIN IMMEDIATE) перед изменением данных,
+    если она еще не открыта, и учитывает изменение в текущей пачке.
+    """
+    global _batch_size, _batch_started
+    if _batch_started is None:
+        begin_transaction()
+        _batch_started = time.monotonic()
+    _batch_size += 1
+
+
+def _commit_batch():
+    """
+    Фиксирует открытую транзакцию интерактивного режима, если она есть.
+    """
+    global _batch_size, _batch_started
+    if _batch_started is not None:
+        commit_transaction()
+        _batch_started = None
+        _batch_size = 0
+
+
+def _input_ready():
+    """
+    Проверяет, есть ли в стандартном вводе данные, так что input() не будет ждать пользователя.
+
+    Returns:
+        bool: True, если данные уже доступны; False, если их нет или проверка невозможна
+              (например, на Windows).
+    """
+    try:
+        readable, _, _ = select.select([sys.stdin], [], [], 0)
+    except (OSError, ValueError):
+        return False
+    return bool(readable)
+
+
+def _prompt(prompt):
+    """
+    Запрашивает ввод у пользователя. Если ввод придется ждать или текущая пачка изменений
+    достигла COMMIT_EVERY изменений или COMMIT_INTERVAL секунд, сначала фиксирует транзакцию,
+    чтобы не держать блокировку базы данных во время ожидания.
+
+    Args:
+        prompt (str): Текст приглашения к вводу.
+
+    Returns:
+        str: Введенная строка.
+    """
+    if _batch_started is not None and (
+        _batch_size >= COMMIT_EVERY
+        or time.monotonic() - _batch_started >= COMMIT_INTERVAL
+        or not _input_ready()
+    ):
+        _commit_batch()
+    return input(prompt)
+
+
+def _prompt_int(prompt):
+    """
+    Запрашивает у пользователя ID задачи.
+
+    Args:
+        prompt (str): Текст приглашения к вводу.
+
+    Returns:
+        int | None: Введенное число или None, если ввод некорректен.
+    """
+    try:
+        return int(_prompt(prompt))
+    except ValueError:
+        print("Некорректный ID!")
+        return None
+
+
+def _do_add():
+    """
+    Добавление новой задачи.
+    """
+    title = _prompt("Введите заголовок задачи: ").strip()
+    description = _prompt("Введите описание задачи (можно оставить пустым): ").strip()
+    _begin_write()
+    task = add_task(title, description)
+    print("Задача добавлена:")
+    print(task)
+
+
+def _do_update():
+    """
+    Обновление заголовка и описания задачи.
+    """
+    task_id = _prompt_int("Введите ID задачи для обновления: ")
+    if task_id is None:
+        return
+    title = _prompt("Введите новый заголовок задачи: ").strip()
+    description = _prompt("Введите новое описание задачи (можно оставить пустым): ").strip()
+    _begin_write()
+    success = update_task(task_id, title, description)
+    if success:
+        print("Задача успешно обновлена!")
+    else:
+        print("Задача с таким ID не найдена.")
+
+
+def _do_delete():
+    """
+    Удаление задачи.
+    """
+    task_id = _prompt_int("Введите ID задачи для удаления: ")
+    if task_id is None:
+        return
+    _begin_write()
+    success = delete_task(task_id)
+    if success:
+        print("Задача успешно удалена!")
+    else:
+        print("Задача с таким ID не найдена.")
+
+
+def _do_mark():
+    """
+    Изменение статуса задачи.
+    """
+    task_id = _prompt_int("Введите ID задачи для изменения статуса: ")
+    if task_id is None:
+        return
+    print("Выберите новый статус:")
+    print("1. todo")
+    print("2. in_progress")
+    print("3. done")
+    status_choice = _prompt("Введите номер статуса: ").strip()
+    new_status = _STATUS_MAP.get(status_choice)
+    if new_status is None:
+        print("Некорректный выбор статуса!")
+        return
+    _begin_write()
+    success = mark_task(task_id, new_status)
+    if success:
+        print(f"Статус задачи с ID {task_id} изменён на '{new_status}'.")
+    else:
+        print("Задача с таким ID не найдена.")
+
+
+def _do_list():
+    """
+    Отображение списка задач с выбором фильтра.
+    """
+    print("Выберите фильтр:")
+    print("1. Все задачи")
+    print("2. Выполненные задачи (done)")
+    print("3. Задачи, не выполненные (not_done)")
+    print("4. Задачи в процессе (in_progress)")
+    filter_choice = _prompt("Введите номер фильтра: ").strip()
+    if filter_choice == "1":
+        tasks = iter_tasks("all")
+    elif filter_choice == "2":
+        tasks = iter_tasks("done")
+    elif filter_choice == "3":
+        tasks = iter_tasks("not_done")
+    elif filter_choice == "4":
+        tasks = iter_tasks("in_progress")
+    else:
+        print("Некорректный выбор фильтра!")
+        return
+
+    # Фиксируем накопленные изменения, чтобы прочитать актуальное состояние базы,
+    # включая изменения других процессов
+    _commit_batch()
+    # Формируем весь список одной строкой и выводим его одной записью
+    output = "\n".join(map(str, tasks))
+    if output:
+        sys.stdout.write(f"\nСписок задач:\n{output}\n")
+    else:
+        print("Нет задач для выбранного фильтра.")
+
+
+# Обработчики пунктов меню интерактивного режима (кроме "6" – выхода)
+_HANDLERS = {
+    "1": _do_add,
+    "2": _do_update,
+    "3": _do_delete,
+    "4": _do_mark,
+    "5": _do_list,
+}
+
+
+def _interactive_loop():
+    """
+    Цикл обработки команд интерактивного режима.
+    """
     while True:
         print("\nВыберите действие:")
         print("1. Добавить задачу")
@@ -27,104 +295,133 @@ def interactive_mode():
         print("5. Показать список задач")
         print("6. Выход")
 
-        choice = input("Введите номер действия: ").strip()
+        try:
+            choice = _prompt("Введите номер действия: ").strip()
 
-        if choice == "6":
-            print("До свидания!")
-            break
+            if choice == "6":
+                print("До свидания!")
+                break
 
-        elif choice == "1":
-            # Добавление новой задачи
-            title = input("Введите заголовок задачи: ").strip()
-            description = input("Введите описание задачи (можно оставить пустым): ").strip()
-            task = add_task(title, description)
-            print("Задача добавлена:")
-            print(task)
-
-        elif choice == "2":
-            # Обновление задачи
-            try:
-                task_id = int(input("Введите ID задачи для обновления: "))
-            except ValueError:
-                print("Некорректный ID!")
+            handler = _HANDLERS.get(choice)
+            if handler is None:
+                print("Некорректный выбор, попробуйте снова.")
                 continue
-            title = input("Введите новый заголовок задачи: ").strip()
-            description = input("Введите новое описание задачи (можно оставить пустым): ").strip()
-            success = update_task(task_id, title, description)
-            if success:
-                print("Задача успешно обновлена!")
-            else:
-                print("Задача с таким ID не найдена.")
+            handler()
+        except sqlite3.OperationalError as error:
+            # Например, база данных надолго заблокирована другим процессом
+            print(f"Ошибка базы данных: {error}. Попробуйте еще раз.")
 
-        elif choice == "3":
-            # Удаление задачи
-            try:
-                task_id = int(input("Введите ID задачи для удаления: "))
-            except ValueError:
-                print("Некорректный ID!")
-                continue
-            success = delete_task(task_id)
-            if success:
-                print("Задача успешно удалена!")
-            else:
-                print("Задача с таким ID не найдена.")
 
-        elif choice == "4":
-            # Изменение статуса задачи
-            try:
-                task_id = int(input("Введите ID задачи для изменения статуса: "))
-            except ValueError:
-                print("Некорректный ID!")
-                continue
-            print("Выберите новый статус:")
-            print("1. todo")
-            print("2. in_progress")
-            print("3. done")
-            status_choice = input("Введите номер статуса: ").strip()
-            if status_choice == "1":
-                new_status = "todo"
-            elif status_choice == "2":
-                new_status = "in_progress"
-            elif status_choice == "3":
-                new_status = "done"
-            else:
-                print("Некорректный выбор статуса!")
-                continue
-            success = mark_task(task_id, new_status)
-            if success:
-                print(f"Статус задачи с ID {task_id} изменён на '{new_status}'.")
-            else:
-                print("Задача с таким ID не найдена.")
-
-        elif choice == "5":
-            # Отображение списка задач с выбором фильтра
-            print("Выберите фильтр:")
-            print("1. Все задачи")
-            print("2. Выполненные задачи (done)")
-            print("3. Задачи, не выполненные (not_done)")
-            print("4. Задачи в процессе (in_progress)")
-            filter_choice = input("Введите номер фильтра: ").strip()
-            if filter_choice == "1":
-                tasks = list_tasks("all")
-            elif filter_choice == "2":
-                tasks = list_tasks("done")
-            elif filter_choice == "3":
-                tasks = list_tasks("not_done")
-            elif filter_choice == "4":
-                tasks = list_tasks("in_progress")
-            else:
-                print("Некорректный выбор фильтра!")
-                continue
+def read_import_rows(file):
+    """
+    Читает задачи для импорта из файла: по одной задаче на строку в формате
+    "заголовок<TAB>описание". Описание можно не указывать, пустые строки пропускаются.
 
-            if tasks:
-                print("\nСписок задач:")
-                for task in tasks:
-                    print(task)
-            else:
-                print("Нет задач для выбранного фильтра.")
+    Args:
+        file (TextIO): Открытый текстовый файл или стандартный ввод.
+
+    Yields:
+        tuple[str, str]: Пары (заголовок, описание).
+    """
+    for line in file:
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+        title, _, description = line.partition("\t")
+        yield title.strip(), description.strip()
+
+
+def import_tasks(path):
+    """
+    Импортирует задачи из файла в кодировке UTF-8 (см. read_import_rows) одной транзакцией.
 
-        else:
-            print("Некорректный выбор, попробуйте снова.")
+    Args:
+        path (str): Путь к файлу или "-" для чтения из стандартного ввода.
+
+    Returns:
+        int: Количество импортированных задач.
+    """
+    if path == "-":
+        # Стандартный ввод читаем в UTF-8 независимо от локали, как и файлы
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8")
+        try:
+            return add_many(read_import_rows(stream))
+        finally:
+            # Отсоединяем обертку, чтобы не закрыть sys.stdin
+            stream.detach()
+    with open(path, "r", encoding="utf-8") as file:
+        return add_many(read_import_rows(file))
+
+
+# Парсер аргументов командной строки, создается один раз при первом обращении (см. _get_parser)
+_PARSER = None
+
+
+def _build_parser():
+    """
+    Создает парсер аргументов командной строки со всеми субкомандами.
+
+    Returns:
+        argparse.ArgumentParser: Настроенный парсер.
+    """
+    # argparse нужен только в режиме CLI, поэтому импортируем его здесь,
+    # чтобы не замедлять запуск интерактивного режима
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Task Tracker CLI - приложение для управления задачами через командную строку"
+    )
+
+    # Определяем субкоманды для различных операций.
+    subparsers = parser.add_subparsers(dest="command", help="Действия, которые можно выполнить")
+
+    # Субкоманда для добавления задачи
+    parser_add = subparsers.add_parser("add", help="Добавить новую задачу")
+    parser_add.add_argument("title", type=str, help="Заголовок задачи")
+    parser_add.add_argument("--description", type=str, default="", help="Описание задачи (опционально)")
+
+    # Субкоманда для обновления задачи
+    parser_update = subparsers.add_parser("update", help="Обновить задачу")
+    parser_update.add_argument("id", type=int, help="ID задачи для обновления")
+    parser_update.add_argument("title", type=str, help="Новый заголовок задачи")
+    parser_update.add_argument("--description", type=str, default="", help="Новое описание задачи (опционально)")
+
+    # Субкоманда для удаления задачи
+    parser_delete = subparsers.add_parser("delete", help="Удалить задачу")
+    parser_delete.add_argument("id", type=int, help="ID задачи для удаления")
+
+    # Субкоманда для изменения статуса задачи
+    parser_mark = subparsers.add_parser("mark", help="Изменить статус задачи")
+    parser_mark.add_argument("id", type=int, help="ID задачи")
+    parser_mark.add_argument("status", type=str, choices=["todo", "in_progress", "done"],
+                             help="Новый статус задачи")
+
+    # Субкоманда для отображения списка задач
+    parser_list = subparsers.add_parser("list", help="Показать список задач")
+    parser_list.add_argument("--filter", type=str, choices=["all", "done", "not_done", "in_progress"],
+                             default="all",
+                             help="Фильтр для отображения задач: all, done, not_done, in_progress")
+
+    # Субкоманда для массового импорта задач
+    parser_import = subparsers.add_parser("import", help="Импортировать задачи из файла или стандартного ввода")
+    parser_import.add_argument("file", nargs="?", default="-",
+                               help="Файл в кодировке UTF-8 со строками \"заголовок<TAB>описание\" "
+                                    "(\"-\" или без аргумента – стандартный ввод)")
+
+    return parser
+
+
+def _get_parser():
+    """
+    Возвращает парсер аргументов командной строки, создавая его только при первом вызове.
+
+    Returns:
+        argparse.ArgumentParser: Настроенный парсер.
+    """
+    global _PARSER
+    if _PARSER is None:
+        _PARSER = _build_parser()
+    return _PARSER
 
 
 def main():
@@ -137,79 +434,68 @@ def main():
         interactive_mode()
     else:
         # Режим работы с аргументами командной строки.
-        parser = argparse.ArgumentParser(
-            description="Task Tracker CLI - приложение для управления задачами через командную строку"
-        )
-
-        # Определяем субкоманды для различных операций.
-        subparsers = parser.add_subparsers(dest="command", help="Действия, которые можно выполнить")
-
-        # Субкоманда для добавления задачи
-        parser_add = subparsers.add_parser("add", help="Добавить новую задачу")
-        parser_add.add_argument("title", type=str, help="Заголовок задачи")
-        parser_add.add_argument("--description", type=str, default="", help="Описание задачи (опционально)")
-
-        # Субкоманда для обновления задачи
-        parser_update = subparsers.add_parser("update", help="Обновить задачу")
-        parser_update.add_argument("id", type=int, help="ID задачи для обновления")
-        parser_update.add_argument("title", type=str, help="Новый заголовок задачи")
-        parser_update.add_argument("--description", type=str, default="", help="Новое описание задачи (опционально)")
-
-        # Субкоманда для удаления задачи
-        parser_delete = subparsers.add_parser("delete", help="Удалить задачу")
-        parser_delete.add_argument("id", type=int, help="ID задачи для удаления")
-
-        # Субкоманда для изменения статуса задачи
-        parser_mark = subparsers.add_parser("mark", help="Изменить статус задачи")
-        parser_mark.add_argument("id", type=int, help="ID задачи")
-        parser_mark.add_argument("status", type=str, choices=["todo", "in_progress", "done"],
-                                 help="Новый статус задачи")
-
-        # Субкоманда для отображения списка задач
-        parser_list = subparsers.add_parser("list", help="Показать список задач")
-        parser_list.add_argument("--filter", type=str, choices=["all", "done", "not_done", "in_progress"],
-                                 default="all",
-                                 help="Фильтр для отображения задач: all, done, not_done, in_progress")
-
+        parser = _get_parser()
         args = parser.parse_args()
 
-        if args.command == "add":
-            new_task = add_task(args.title, args.description)
-            print("Добавлена задача:")
-            print(new_task)
+        try:
+            if args.command == "add":
+                new_task = add_task(args.title, args.description)
+                print("Добавлена задача:")
+                print(new_task)
 
-        elif args.command == "update":
-            success = update_task(args.id, args.title, args.description)
-            if success:
-                print(f"Задача с ID {args.id} успешно обновлена.")
-            else:
-                print(f"Задача с ID {args.id} не найдена.")
+            elif args.command == "update":
+                success = update_task(args.id, args.title, args.description)
+                if success:
+                    print(f"Задача с ID {args.id} успешно обновлена.")
+                else:
+                    print(f"Задача с ID {args.id} не найдена.")
 
-        elif args.command == "delete":
-            success = delete_task(args.id)
-            if success:
-                print(f"Задача с ID {args.id} успешно удалена.")
-            else:
-                print(f"Задача с ID {args.id} не найдена.")
+            elif args.command == "delete":
+                success = delete_task(args.id)
+                if success:
+                    print(f"Задача с ID {args.id} успешно удалена.")
+                else:
+                    print(f"Задача с ID {args.id} не найдена.")
 
-        elif args.command == "mark":
-            success = mark_task(args.id, args.status)
-            if success:
-                print(f"Статус задачи с ID {args.id} изменён на '{args.status}'.")
-            else:
-                print(f"Задача с ID {args.id} не найдена.")
-
-        elif args.command == "list":
-            tasks = list_tasks(filter_by=args.filter)
-            if tasks:
-                print("Список задач:")
-                for task in tasks:
-                    print(task)
+            elif args.command == "mark":
+                success = mark_task(args.id, args.status)
+                if success:
+                    print(f"Статус задачи с ID {args.id} изменён на '{args.status}'.")
+                else:
+                    print(f"Задача с ID {args.id} не найдена.")
+
+            elif args.command == "list":
+                tasks = iter_tasks(filter_by=args.filter)
+                # Формируем весь список одной строкой и выводим его одной записью
+                output = "\n".join(map(str, tasks))
+                if output:
+                    sys.stdout.write(f"Список задач:\n{output}\n")
+                else:
+                    print("Задачи не найдены для заданного фильтра.")
+
+            elif args.command == "import":
+                try:
+                    count = import_tasks(args.file)
+                except OSError as error:
+                    print(f"Не удалось открыть файл импорта: {error}", file=sys.stderr)
+                    sys.exit(1)
+                except UnicodeDecodeError:
+                    print("Файл импорта должен быть в кодировке UTF-8. Ни одна задача не импортирована.",
+                          file=sys.stderr)
+                    sys.exit(1)
+                print(f"Импортировано задач: {count}")
             else:
-                print("Задачи не найдены для заданного фильтра.")
-        else:
-            parser.print_help()
+                parser.print_help()
+
+        except sqlite3.OperationalError as error:
+            # Например, база данных надолго заблокирована другим процессом
+            print(f"Ошибка базы данных: {error}", file=sys.stderr)
+            sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        # Сохраняем незафиксированные изменения и закрываем базу при любом завершении программы
+        close_connection()
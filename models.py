@@ -8,6 +8,9 @@ class Task:
     """
     Класс Task представляет задачу в трекере.
 
+    Экземпляры хранят атрибуты в слотах (__slots__), без словаря __dict__,
+    что уменьшает расход памяти и ускоряет доступ к атрибутам.
+
     Атрибуты:
         id (int): Уникальный идентификатор задачи.
         title (str): Заголовок задачи.
@@ -18,6 +21,8 @@ class Task:
                       "done" - задача выполнена.
     """
 
+    __slots__ = ("id", "title", "description", "status")
+
     def __init__(self, task_id, title, description, status="todo"):
         # Инициализация задачи с заданными параметрами
         self.id = task_id                # Уникальный идентификатор задачи
@@ -57,6 +62,20 @@ class Task:
             status=task_dict.get("status", "todo")
         )
 
+    @classmethod
+    def from_tuple(cls, row):
+        """
+        Создает объект Task из кортежа (id, title, description, status),
+        например из строки результата запроса к базе данных.
+
+        Args:
+            row (tuple): Кортеж с данными задачи в порядке полей класса.
+
+        Returns:
+            Task: Объект Task, созданный на основе данных кортежа.
+        """
+        return cls(*row)
+
     def __str__(self):
         """
         Возвращает строковое представление задачи для удобного отображения в консоли.
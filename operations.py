@@ -2,75 +2,187 @@
 Модуль operations.py
 --------------------
 Содержит функции для выполнения основных операций с задачами:
-- загрузка и сохранение задач в JSON файл,
+- хранение задач в базе данных SQLite,
 - добавление, обновление, удаление задач,
 - изменение статуса задачи,
 - фильтрация и получение списка задач.
 """
 
-import json
 import os
+import sqlite3
 from models import Task
 
-# Определяем имя файла, в котором будут храниться задачи
+# Определяем имя файла базы данных, в которой будут храниться задачи
+TASKS_DB = "tasks.db"
+
+# Файл, в котором задачи хранились до перехода на SQLite (см. _migrate_json)
 TASKS_FILE = "tasks.json"
 
-def load_tasks():
+# Соединение с базой данных, открывается один раз на процесс (см. _get_conn)
+_conn = None
+
+def _get_conn():
     """
-    Загружает список задач из файла TASKS_FILE.
+    Возвращает соединение с базой данных TASKS_DB.
 
-    Если файл не существует или поврежден, возвращает пустой список.
+    При первом вызове открывает соединение в режиме автокоммита, включает журнал WAL
+    и создает таблицу задач вместе с индексом по статусу, если их еще нет.
+    Последующие вызовы возвращают уже открытое соединение.
 
     Returns:
-        list[Task]: Список объектов Task.
+        sqlite3.Connection: Соединение с базой данных.
+    """
+    global _conn
+    if _conn is None:
+        conn = sqlite3.connect(TASKS_DB, isolation_level=None)
+        # WAL и synchronous=NORMAL избавляют от синхронизации диска на каждую запись,
+        # busy_timeout позволяет дождаться блокировки, если базу использует другой процесс
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "id INTEGER PRIMARY KEY, "
+            "title TEXT NOT NULL, "
+            "description TEXT NOT NULL DEFAULT '', "
+            "status TEXT NOT NULL DEFAULT 'todo')"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status)")
+        _migrate_json(conn)
+        _conn = conn
+    return _conn
+
+def _migrate_json(conn):
+    """
+    Однократно переносит задачи из файла TASKS_FILE прежней версии в базу данных.
+
+    Перенос выполняется, только если таблица задач пуста. Задачи сохраняют свои id;
+    задачи без корректного id или с повторяющимся id получают новый id.
+    После переноса файл переименовывается в TASKS_FILE + ".migrated",
+    чтобы не импортировать его повторно. Поврежденный файл или файл неожиданной
+    структуры не трогается, как и прежде, в этом случае задачи из него не загружаются.
+
+    Args:
+        conn (sqlite3.Connection): Соединение с базой данных.
     """
-    if not os.path.exists(TASKS_FILE):
-        # Если файл не существует, возвращаем пустой список
-        return []
-    with open(TASKS_FILE, "r", encoding="utf-8") as file:
+    try:
+        file = open(TASKS_FILE, "r", encoding="utf-8")
+    except FileNotFoundError:
+        # Файла нет (или его уже перенес другой процесс)
+        return
+    # json нужен только для переноса, поэтому импортируем его здесь
+    import json
+    with file:
         try:
-            # Считываем данные и создаем список задач из словарей
             tasks_data = json.load(file)
-            tasks = [Task.from_dict(td) for td in tasks_data]
-            return tasks
-        except json.JSONDecodeError:
-            # Если файл не удается декодировать, возвращаем пустой список
-            return []
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            return
+    if not isinstance(tasks_data, list) or not all(isinstance(td, dict) for td in tasks_data):
+        return
+
+    # Сначала задачи с корректным уникальным id, затем остальные с id, назначаемым базой,
+    # чтобы новые id не совпали с еще не вставленными исходными
+    seen_ids = set()
+    rows_with_id = []
+    rows_without_id = []
+    for td in tasks_data:
+        task_id = td.get("id")
+        fields = (td.get("title") or "", td.get("description") or "", td.get("status") or "todo")
+        if isinstance(task_id, int) and not isinstance(task_id, bool) and task_id not in seen_ids:
+            seen_ids.add(task_id)
+            rows_with_id.append((task_id,) + fields)
+        else:
+            rows_without_id.append((None,) + fields)
 
-def save_tasks(tasks):
+    # BEGIN IMMEDIATE не дает двум процессам перенести задачи одновременно:
+    # второй дождется блокировки и увидит уже заполненную таблицу
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        migrated = conn.execute("SELECT 1 FROM tasks LIMIT 1").fetchone() is None
+        if migrated:
+            conn.executemany(
+                "INSERT INTO tasks(id, title, description, status) VALUES(?, ?, ?, ?)",
+                rows_with_id + rows_without_id,
+            )
+    except BaseException:
+        conn.rollback()
+        raise
+    conn.commit()
+    # Переименовывает файл только тот процесс, который перенес задачи
+    if migrated:
+        try:
+            os.replace(TASKS_FILE, TASKS_FILE + ".migrated")
+        except FileNotFoundError:
+            pass
+
+def begin_transaction():
     """
-    Сохраняет список задач в файл TASKS_FILE в формате JSON.
+    Открывает явную транзакцию на запись, если она еще не открыта.
 
-    Args:
-        tasks (list[Task]): Список объектов Task, который необходимо сохранить.
+    BEGIN IMMEDIATE сразу захватывает блокировку на запись (ожидая ее не дольше busy_timeout),
+    поэтому последующие изменения в транзакции не упираются в устаревший снимок базы.
+    Все изменения накапливаются в транзакции и записываются на диск
+    одной синхронизацией при вызове commit_transaction().
     """
-    # Преобразуем каждый объект Task в словарь
-    tasks_data = [task.to_dict() for task in tasks]
-    with open(TASKS_FILE, "w", encoding="utf-8") as file:
-        # Записываем данные с отступами для удобочитаемости и с отключенной ASCII-кодировкой
-        json.dump(tasks_data, file, indent=4, ensure_ascii=False)
+    conn = _get_conn()
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
 
-def get_new_task_id(tasks):
+def commit_transaction():
     """
-    Генерирует новый уникальный идентификатор для новой задачи.
+    Фиксирует текущую транзакцию, если она открыта.
+    """
+    conn = _get_conn()
+    if conn.in_transaction:
+        conn.commit()
+
+def close_connection():
+    """
+    Фиксирует незавершенную транзакцию и закрывает соединение с базой данных.
+
+    При закрытии последнего соединения SQLite переносит журнал WAL в основной файл базы.
+    Следующий вызов _get_conn() откроет соединение заново.
+    """
+    global _conn
+    if _conn is not None:
+        commit_transaction()
+        _conn.close()
+        _conn = None
+
+def add_many(rows):
+    """
+    Добавляет сразу несколько задач со статусом "todo" в рамках одной транзакции.
+
+    Если транзакция уже открыта (например, в интерактивном режиме), задачи добавляются в нее,
+    иначе открывается и фиксируется собственная транзакция.
 
     Args:
-        tasks (list[Task]): Список существующих задач.
+        rows (Iterable[tuple[str, str]]): Пары (заголовок, описание) новых задач.
 
     Returns:
-        int: Новый уникальный идентификатор.
+        int: Количество добавленных задач.
     """
-    if not tasks:
-        return 1
-    else:
-        # Находим максимальный id в существующих задачах и увеличиваем его на 1
-        max_id = max(task.id for task in tasks)
-        return max_id + 1
+    conn = _get_conn()
+    own_transaction = not conn.in_transaction
+    if own_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    try:
+        cursor = conn.executemany(
+            "INSERT INTO tasks(title, description, status) VALUES(?, ?, 'todo')",
+            rows,
+        )
+    except BaseException:
+        if own_transaction:
+            conn.rollback()
+        raise
+    if own_transaction:
+        conn.commit()
+    return cursor.rowcount
 
 def add_task(title, description):
     """
     Добавляет новую задачу с заданными заголовком и описанием.
-    Новый объект Task создается со статусом "todo".
+    Новая задача создается со статусом "todo".
 
     Args:
         title (str): Заголовок новой задачи.
@@ -79,17 +191,10 @@ def add_task(title, description):
     Returns:
         Task: Объект добавленной задачи.
     """
-    # Загружаем текущий список задач
-    tasks = load_tasks()
-    # Генерируем новый уникальный идентификатор для задачи
-    new_id = get_new_task_id(tasks)
-    # Создаем новый объект Task
-    new_task = Task(new_id, title, description, status="todo")
-    # Добавляем задачу в список
-    tasks.append(new_task)
-    # Сохраняем обновленный список задач
-    save_tasks(tasks)
-    return new_task
+    add_many([(title, description)])
+    # Идентификатор назначается базой данных (INTEGER PRIMARY KEY)
+    new_id = _get_conn().execute("SELECT last_insert_rowid()").fetchone()[0]
+    return Task(new_id, title, description, status="todo")
 
 def update_task(task_id, title, description):
     """
@@ -103,21 +208,11 @@ def update_task(task_id, title, description):
     Returns:
         bool: True, если задача обновлена успешно, иначе False.
     """
-    tasks = load_tasks()
-    updated = False
-    # Перебираем список задач для поиска нужной по id
-    for task in tasks:
-        if task.id == task_id:
-            task.title = title            # Обновляем заголовок
-            task.description = description  # Обновляем описание
-            updated = True
-            break  # Прерываем цикл, т.к. задача найдена
-    if updated:
-        # Сохраняем изменения в файл
-        save_tasks(tasks)
-        return True
-    else:
-        return False
+    cursor = _get_conn().execute(
+        "UPDATE tasks SET title = ?, description = ? WHERE id = ?",
+        (title, description, task_id),
+    )
+    return cursor.rowcount > 0
 
 def delete_task(task_id):
     """
@@ -129,16 +224,8 @@ def delete_task(task_id):
     Returns:
         bool: True, если задача найдена и удалена, иначе False.
     """
-    tasks = load_tasks()
-    # Фильтруем список, исключая задачу с указанным id
-    updated_tasks = [task for task in tasks if task.id != task_id]
-    if len(updated_tasks) == len(tasks):
-        # Если ни одна задача не удалена, то задача не найдена
-        return False
-    else:
-        # Сохраняем новый список задач
-        save_tasks(updated_tasks)
-        return True
+    cursor = _get_conn().execute("DELETE FROM tasks WHERE id = ?", (task_id,))
+    return cursor.rowcount > 0
 
 def mark_task(task_id, new_status):
     """
@@ -151,24 +238,18 @@ def mark_task(task_id, new_status):
     Returns:
         bool: True, если задача найдена и статус изменен, иначе False.
     """
-    tasks = load_tasks()
-    updated = False
-    # Ищем задачу по id и меняем ее статус
-    for task in tasks:
-        if task.id == task_id:
-            task.status = new_status  # Изменяем статус
-            updated = True
-            break
-    if updated:
-        # Сохраняем изменения после обновления статуса
-        save_tasks(tasks)
-        return True
-    else:
-        return False
-
-def list_tasks(filter_by="all"):
-    """
-    Возвращает список задач на основе указанного фильтра.
+    cursor = _get_conn().execute(
+        "UPDATE tasks SET status = ? WHERE id = ?",
+        (new_status, task_id),
+    )
+    return cursor.rowcount > 0
+
+def iter_tasks(filter_by="all"):
+    """
+    Возвращает задачи на основе указанного фильтра по мере чтения их из базы данных.
+
+    Фильтрация выполняется в запросе (по индексу idx_tasks_status), так что
+    в память не загружаются задачи, не подходящие под фильтр.
 
     Args:
         filter_by (str): Фильтр для задач.
@@ -177,19 +258,18 @@ def list_tasks(filter_by="all"):
                          "not_done" - задачи, которые не выполнены (status != "done"),
                          "in_progress" - задачи, находящиеся в процессе выполнения (status == "in_progress").
 
-    Returns:
-        list[Task]: Отфильтрованный список задач.
+    Yields:
+        Task: Задачи, подходящие под фильтр, в порядке возрастания id.
     """
-    tasks = load_tasks()
-    if filter_by == "all":
-        return tasks
-    elif filter_by == "done":
-        return [task for task in tasks if task.status == "done"]
+    query = "SELECT id, title, description, status FROM tasks"
+    params = ()
+    if filter_by in ("done", "in_progress"):
+        query += " WHERE status = ?"
+        params = (filter_by,)
     elif filter_by == "not_done":
-        # Возвращаем задачи, у которых статус не равен "done"
-        return [task for task in tasks if task.status != "done"]
-    elif filter_by == "in_progress":
-        return [task for task in tasks if task.status == "in_progress"]
-    else:
-        # Если указан неизвестный фильтр – возвращаем все задачи
-        return tasks
+        # Задачи, у которых статус не равен "done"
+        query += " WHERE status != 'done'"
+    # Для "all" и неизвестного фильтра возвращаем все задачи
+    query += " ORDER BY id"
+    for row in _get_conn().execute(query, params):
+        yield Task.from_tuple(row)